@@ -5,6 +5,23 @@ import numpy as np
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import datetime
+import hashlib
+from collections import namedtuple
+
+# Aceleradores opcionales (no están en requirements.txt, ver los comentarios allí)
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    # Sin numba el RSI y los cruces se calculan con pandas/NumPy
+    NUMBA_AVAILABLE = False
+
+try:
+    import numexpr as ne
+    NUMEXPR_AVAILABLE = True
+except ImportError:
+    # Sin numexpr las fórmulas se evalúan con NumPy
+    NUMEXPR_AVAILABLE = False
 
 # Configuración de la página
 st.set_page_config(
@@ -14,6 +31,32 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Máximo de velas (y puntos de la línea RSI) que se envían al gráfico
+MAX_PLOT_CANDLES = 5000
+
+# Cruces: un array por campo - índice de la vela, código de tipo (ver CROSS_TYPES) y valor del RSI
+Crosses = namedtuple('Crosses', 'idx type_code rsi')
+CROSS_TYPES = np.array(['overbought', 'oversold'])
+
+@st.cache_data(ttl=300, show_spinner=False)
+def download_data(symbol, period, interval):
+    """Descarga el histórico de Yahoo Finance (cacheado 5 minutos por símbolo, período e intervalo)"""
+    data = yf.download(
+        symbol,
+        period=period,
+        interval=interval,
+        auto_adjust=True,
+        actions=False,
+        prepost=False,
+        threads=False,
+        progress=False
+    )
+    
+    # Versiones recientes de yfinance devuelven columnas (Precio, Símbolo) incluso para un solo símbolo
+    if isinstance(data.columns, pd.MultiIndex):
+        data.columns = data.columns.get_level_values(0)
+    return data
+
 def calculate_rsi_tradingview(prices, period=14):
     """
     Calcula el RSI usando el método de Wilder (igual al de TradingView)
@@ -22,22 +65,23 @@ def calculate_rsi_tradingview(prices, period=14):
     delta = prices.diff()
     
     # Separar ganancias y pérdidas
-    gain = delta.where(delta > 0, 0)
-    loss = -delta.where(delta < 0, 0)
+    gain = delta.clip(lower=0.0)
+    loss = (-delta).clip(lower=0.0)
     
-    # Calcular la primera media simple para los primeros 14 períodos
-    avg_gain = gain.rolling(window=period).mean()
-    avg_loss = loss.rolling(window=period).mean()
-    
-    # Aplicar suavizado de Wilder para el resto de los datos
-    # La fórmula de Wilder: nuevo_promedio = ((período-1) * promedio_anterior + nuevo_valor) / período
+    # Suavizado de Wilder: nuevo_promedio = ((período-1) * promedio_anterior + nuevo_valor) / período
     # Esto es equivalente a EMA con alpha = 1/período
-    
-    for i in range(period, len(prices)):
-        avg_gain.iloc[i] = ((avg_gain.iloc[i-1] * (period - 1)) + gain.iloc[i]) / period
-        avg_loss.iloc[i] = ((avg_loss.iloc[i-1] * (period - 1)) + loss.iloc[i]) / period
+    avg_gain = gain.ewm(alpha=1.0 / period, adjust=False, min_periods=period).mean()
+    avg_loss = loss.ewm(alpha=1.0 / period, adjust=False, min_periods=period).mean()
     
     # Calcular RS y RSI
+    if NUMEXPR_AVAILABLE:
+        # Una sola pasada sobre los arrays, sin temporales intermedios
+        rsi_values = ne.evaluate(
+            '100.0 - 100.0 / (1.0 + ag / al)',
+            local_dict={'ag': avg_gain.to_numpy(), 'al': avg_loss.to_numpy()}
+        )
+        return pd.Series(rsi_values, index=prices.index, name=prices.name)
+    
     rs = avg_gain / avg_loss
     rsi = 100 - (100 / (1 + rs))
     
@@ -45,44 +89,162 @@ def calculate_rsi_tradingview(prices, period=14):
 
 def detect_rsi_crosses(rsi_series, overbought=70, oversold=30):
     """Detecta cruces del RSI por encima de 70 o por debajo de 30"""
-    crosses = []
-    for i in range(1, len(rsi_series)):
-        current_rsi = rsi_series.iloc[i]
-        prev_rsi = rsi_series.iloc[i-1]
+    rsi = np.asarray(rsi_series, dtype=np.float64)
+    prev_rsi = rsi[:-1]
+    current_rsi = rsi[1:]
+    
+    # Las comparaciones con NaN son siempre falsas, así que no hace falta filtrarlos
+    ob_idx = np.flatnonzero((prev_rsi <= overbought) & (current_rsi > overbought)) + 1
+    os_idx = np.flatnonzero((prev_rsi >= oversold) & (current_rsi < oversold)) + 1
+    
+    cross_idx = np.concatenate((ob_idx, os_idx))
+    type_code = np.repeat(np.array([0, 1], dtype=np.uint8), [ob_idx.size, os_idx.size])
+    order = np.argsort(cross_idx, kind='stable')
+    cross_idx = cross_idx[order]
+    return Crosses(cross_idx, type_code[order], rsi[cross_idx])
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, error_model='numpy')
+    def _rsi_and_crosses(close, period, ob, os_):
+        """
+        RSI de Wilder y detección de cruces en una sola pasada (compilado con numba)
+        Devuelve (rsi, cross_idx, cross_type, cross_rsi); cross_type: 0=overbought, 1=oversold
+        """
+        n = close.size
+        rsi = np.full(n, np.nan)
+        cross_idx = np.empty(n, dtype=np.int64)
+        cross_type = np.empty(n, dtype=np.uint8)
+        cross_rsi = np.empty(n)
+        n_crosses = 0
         
-        # Evitar valores NaN
-        if pd.isna(current_rsi) or pd.isna(prev_rsi):
-            continue
+        # Suavizado de Wilder: nuevo_promedio = ((período-1) * promedio_anterior + nuevo_valor) / período
+        # Igual que ewm(alpha=1/período, adjust=False, min_periods=período) en calculate_rsi_tradingview:
+        # se siembra con el primer cambio válido y, como ewm, un cambio NaN no actualiza los promedios
+        # pero sigue decayendo el peso del promedio anterior
+        alpha = 1.0 / period
+        avg_gain = np.nan
+        avg_loss = np.nan
+        old_wt = 1.0
+        n_obs = 0
+        for i in range(1, n):
+            delta = close[i] - close[i-1]
+            if delta == delta:
+                n_obs += 1
+                gain = delta if delta > 0.0 else 0.0
+                loss = -delta if delta < 0.0 else 0.0
+                
+                if avg_gain != avg_gain:
+                    avg_gain = gain
+                    avg_loss = loss
+                else:
+                    old_wt *= 1.0 - alpha
+                    avg_gain = (old_wt * avg_gain + alpha * gain) / (old_wt + alpha)
+                    avg_loss = (old_wt * avg_loss + alpha * loss) / (old_wt + alpha)
+                old_wt = 1.0
+            elif avg_gain == avg_gain:
+                old_wt *= 1.0 - alpha
             
-        if prev_rsi <= overbought and current_rsi > overbought:
-            crosses.append((i, 'overbought', current_rsi))
-        elif prev_rsi >= oversold and current_rsi < oversold:
-            crosses.append((i, 'oversold', current_rsi))
-    return crosses
+            if n_obs < period:
+                continue
+            rsi[i] = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+            
+            # Los NaN nunca cumplen las comparaciones, igual que en detect_rsi_crosses
+            prev_rsi = rsi[i-1]
+            current_rsi = rsi[i]
+            if prev_rsi <= ob and current_rsi > ob:
+                cross_idx[n_crosses] = i
+                cross_type[n_crosses] = 0
+                cross_rsi[n_crosses] = current_rsi
+                n_crosses += 1
+            elif prev_rsi >= os_ and current_rsi < os_:
+                cross_idx[n_crosses] = i
+                cross_type[n_crosses] = 1
+                cross_rsi[n_crosses] = current_rsi
+                n_crosses += 1
+        
+        return rsi, cross_idx[:n_crosses], cross_type[:n_crosses], cross_rsi[:n_crosses]
+
+def data_fingerprint(data):
+    """
+    Huella completa (índice y todos los valores) de una Serie o DataFrame, usada como clave de caché
+    El hash por defecto de Streamlit solo muestrea las series grandes
+    """
+    digest = hashlib.blake2b(data.index.asi8.tobytes())
+    digest.update(np.ascontiguousarray(data.to_numpy()).tobytes())
+    return digest.hexdigest()
+
+def analyze_rsi(prices, period=14, overbought=70, oversold=30):
+    """Calcula el RSI y sus cruces, usando el kernel de numba si está disponible"""
+    if not NUMBA_AVAILABLE:
+        rsi = calculate_rsi_tradingview(prices, period)
+        return rsi, detect_rsi_crosses(rsi, overbought, oversold)
+    
+    # Copia escribible: pandas puede devolver arrays de solo lectura, que numba compila
+    # como otra especialización distinta de la precompilada en warm_up_numba
+    rsi_values, cross_idx, cross_type, cross_rsi = _rsi_and_crosses(
+        prices.to_numpy(dtype=np.float64, copy=True), period, float(overbought), float(oversold)
+    )
+    rsi = pd.Series(rsi_values, index=prices.index, name=prices.name)
+    return rsi, Crosses(cross_idx, cross_type, cross_rsi)
+
+@st.cache_data(ttl=300, max_entries=32, show_spinner=False)
+def cached_analyze_rsi(prices_key, _prices, period, overbought, oversold):
+    """
+    analyze_rsi cacheado por la huella de los precios (prices_key) y los parámetros del RSI
+    _prices no se hashea: su contenido ya está en prices_key
+    """
+    return analyze_rsi(_prices, period, overbought, oversold)
 
-def calculate_ohlc_average(row):
+@st.cache_resource(show_spinner=False)
+def warm_up_numba():
+    """Compila el kernel de numba una vez por proceso, antes del primer análisis"""
+    if NUMBA_AVAILABLE:
+        _rsi_and_crosses(np.ones(32, dtype=np.float64), 14, 70.0, 30.0)
+    return NUMBA_AVAILABLE
+
+warm_up_numba()
+
+def calculate_ohlc_average(data):
     """Calcula el promedio de Open, High, Low, Close"""
-    return (row['Open'] + row['High'] + row['Low'] + row['Close']) / 4
+    if NUMEXPR_AVAILABLE:
+        ohlc_avg = ne.evaluate(
+            '(o + h + l + c) * 0.25',
+            local_dict={
+                'o': data['Open'].to_numpy(),
+                'h': data['High'].to_numpy(),
+                'l': data['Low'].to_numpy(),
+                'c': data['Close'].to_numpy()
+            }
+        )
+        return pd.Series(ohlc_avg, index=data.index)
+    return (data['Open'] + data['High'] + data['Low'] + data['Close']) * 0.25
 
 def create_cycles(crosses, data_length):
-    """Crea ciclos desde un cruce hasta el siguiente"""
-    cycles = []
-    for i in range(len(crosses)):
-        start_idx = crosses[i][0]
-        if i < len(crosses) - 1:
-            end_idx = crosses[i+1][0] - 1
-        else:
-            end_idx = data_length - 1
-        cycles.append({
-            'start': start_idx,
-            'end': end_idx,
-            'cross_type': crosses[i][1],
-            'cross_rsi': crosses[i][2]
-        })
-    return cycles
+    """
+    Crea ciclos desde un cruce hasta el siguiente
+    Devuelve un array por campo: start, end, type (código de CROSS_TYPES) y rsi
+    """
+    starts = crosses.idx.copy()
+    ends = np.empty_like(starts)
+    ends[:-1] = starts[1:] - 1
+    ends[-1:] = data_length - 1
+    return {
+        'start': starts,
+        'end': ends,
+        'type': crosses.type_code.copy(),
+        'rsi': crosses.rsi.copy()
+    }
+
+def downsample_segments(n_bars, target=MAX_PLOT_CANDLES):
+    """
+    Posiciones donde empieza cada vela del gráfico, como mucho target: tramos del mismo tamaño
+    para que Plotly dibuje todas las velas con el mismo ancho
+    """
+    bucket = max(1, -(-n_bars // target))
+    return np.arange(0, n_bars, bucket)
 
-def create_interactive_plot(symbol, data, crosses, cycles, show_price_labels=True, show_cross_points=True):
-    """Crea un gráfico interactivo con Plotly"""
+def create_interactive_plot(symbol, data, crosses, cycles, is_green, show_price_labels=True, show_cross_points=True):
+    """Crea un gráfico interactivo con Plotly; is_green indica el resultado de cada ciclo"""
     
     # Crear subplots
     fig = make_subplots(
@@ -93,52 +255,61 @@ def create_interactive_plot(symbol, data, crosses, cycles, show_price_labels=Tru
         subplot_titles=[f'{symbol} - Ciclos RSI', 'RSI']
     )
     
-    # Determinar colores de los ciclos
-    cycle_colors = []
-    for cycle in cycles:
-        cross_price = data['OHLC_Avg'].iloc[cycle['start']]
-        last_close = data['Close'].iloc[cycle['end']]
-        color = 'green' if last_close > cross_price else 'red'
-        cycle_colors.append(color)
-    
-    # Crear candlestick por ciclos - CORREGIDO
-    for i, cycle in enumerate(cycles):
-        start_idx = cycle['start']
-        end_idx = min(cycle['end'], len(data) - 1)
-        color = cycle_colors[i]
-        
-        cycle_data = data.iloc[start_idx:end_idx + 1]
-        
-        # Definir colores uniformes para todo el ciclo
-        if color == 'green':
-            line_color = 'darkgreen'
-            fill_color = 'rgba(0, 255, 0, 0.7)'
-        else:
-            line_color = 'darkred' 
-            fill_color = 'rgba(255, 0, 0, 0.7)'
-        
-        # Candlestick para este ciclo - TODAS LAS VELAS DEL MISMO COLOR
+    # El navegador dibuja en float32: reducir a la mitad los bytes serializados
+    plot_data = data[['Open', 'High', 'Low', 'Close', 'OHLC_Avg', 'RSI']].astype('float32')
+    open_, high, low, close, ohlc_avg, rsi = (plot_data[col].to_numpy() for col in plot_data.columns)
+    
+    # Índice de fechas resuelto una sola vez; se accede por posición con take()
+    dates = data.index
+    
+    # Asignar a cada vela el color de su ciclo (los ciclos son consecutivos hasta el final)
+    starts = cycles['start']
+    ends = np.minimum(cycles['end'], len(data) - 1)
+    bar_is_green = np.repeat(is_green, ends - starts + 1)
+    
+    # Reducir series largas a como mucho MAX_PLOT_CANDLES velas agregadas (el RSI se calculó sobre todos los datos)
+    seg_starts = downsample_segments(len(data))
+    seg_ends = np.append(seg_starts[1:], len(data)) - 1
+    seg_open = open_[seg_starts]
+    seg_high = np.maximum.reduceat(high, seg_starts)
+    seg_low = np.minimum.reduceat(low, seg_starts)
+    seg_close = close[seg_ends]
+    
+    # Solo se dibujan las velas a partir del primer cruce; cada vela agregada toma el color
+    # del ciclo de su primera vela (los puntos de cruce se siguen dibujando en su posición exacta)
+    seg_pos = np.flatnonzero(seg_ends >= starts[0])
+    seg_is_green = bar_is_green[np.maximum(seg_starts[seg_pos], starts[0]) - starts[0]]
+    
+    # Un candlestick por color - TODAS LAS VELAS DE UN CICLO DEL MISMO COLOR
+    for mask, line_color, fill_color, name in (
+        (seg_is_green, 'darkgreen', 'rgba(0, 255, 0, 0.7)', 'Ciclos verdes'),
+        (~seg_is_green, 'darkred', 'rgba(255, 0, 0, 0.7)', 'Ciclos rojos'),
+    ):
+        if not mask.any():
+            continue
+        pos = seg_pos[mask]
         fig.add_trace(
             go.Candlestick(
-                x=cycle_data.index,
-                open=cycle_data['Open'],
-                high=cycle_data['High'],
-                low=cycle_data['Low'],
-                close=cycle_data['Close'],
+                x=dates.take(seg_starts[pos]),
+                open=seg_open[pos],
+                high=seg_high[pos],
+                low=seg_low[pos],
+                close=seg_close[pos],
                 increasing_line_color=line_color,
                 decreasing_line_color=line_color,
                 increasing_fillcolor=fill_color,
                 decreasing_fillcolor=fill_color,
-                name=f'Ciclo {i+1} ({cycle["cross_type"]})',
-                showlegend=i == 0  # Solo mostrar leyenda para el primer ciclo
+                name=name
             ),
             row=1, col=1
         )
     
     # Puntos de cruce
-    cross_dates = [data.index[idx] for idx, _, _ in crosses if idx < len(data)]
-    cross_prices = [data['OHLC_Avg'].iloc[idx] for idx, _, _ in crosses if idx < len(data)]
-    cross_rsi = [rsi_val for idx, _, rsi_val in crosses if idx < len(data)]
+    valid = crosses.idx < len(data)
+    cross_idx = crosses.idx[valid]
+    cross_dates = dates.take(cross_idx)
+    cross_prices = ohlc_avg[cross_idx]
+    cross_rsi = crosses.rsi[valid].astype(np.float32)
     
     # Puntos de cruce en el gráfico de precios
     if show_cross_points:
@@ -148,7 +319,7 @@ def create_interactive_plot(symbol, data, crosses, cycles, show_price_labels=Tru
                 y=cross_prices,
                 mode='markers+text' if show_price_labels else 'markers',
                 marker=dict(color='blue', size=10),
-                text=[f'${price:.2f}' for price in cross_prices] if show_price_labels else None,
+                text=np.char.mod('$%.2f', data['OHLC_Avg'].to_numpy()[cross_idx]) if show_price_labels else None,
                 textposition='middle left' if show_price_labels else None,
                 name='Cruces RSI',
                 showlegend=True
@@ -159,8 +330,8 @@ def create_interactive_plot(symbol, data, crosses, cycles, show_price_labels=Tru
     # Gráfico RSI
     fig.add_trace(
         go.Scatter(
-            x=data.index,
-            y=data['RSI'],
+            x=dates.take(seg_starts),
+            y=rsi[seg_starts],
             mode='lines',
             name='RSI',
             line=dict(color='purple', width=2)
@@ -211,6 +382,25 @@ def create_interactive_plot(symbol, data, crosses, cycles, show_price_labels=Tru
     
     return fig
 
+@st.cache_data(ttl=300, max_entries=32, show_spinner=False)
+def format_crosses(dates, type_codes, prices, rsi_values):
+    """Tabla de detalle de cruces con fecha, tipo, precio y RSI ya formateados"""
+    return pd.DataFrame({
+        'Fecha': dates.dt.strftime('%Y-%m-%d %H:%M').to_numpy(),
+        'Tipo': np.char.capitalize(CROSS_TYPES)[type_codes],
+        'Precio': np.char.mod('$%.2f', prices),
+        'RSI': np.char.mod('%.1f', rsi_values)
+    })
+
+@st.cache_resource(show_spinner=False, max_entries=8)
+def build_cached_plot(data_key, rsi_params, symbol, show_price_labels, show_cross_points,
+                      _data, _crosses, _cycles, _is_green):
+    """
+    Construye el gráfico una sola vez por datos (data_key), parámetros RSI y opciones de visualización
+    Los argumentos con guion bajo no se hashean: se derivan de data_key y rsi_params
+    """
+    return create_interactive_plot(symbol, _data, _crosses, _cycles, _is_green, show_price_labels, show_cross_points)
+
 def main():
     # Título y descripción
     st.title("🚀 Analizador")
@@ -288,27 +478,30 @@ def main():
         with st.spinner(f"📡 Descargando datos de {symbol}..."):
             try:
                 # Descargar datos
-                ticker = yf.Ticker(symbol)
-                data = ticker.history(period=period, interval=interval)
+                data = download_data(symbol, period, interval)
                 
                 if data.empty:
                     st.error("❌ No se pudieron descargar los datos. Verifica el símbolo.")
                     return
                 
-                # Calcular indicadores - USANDO NUEVO MÉTODO DE WILDER
-                data['RSI'] = calculate_rsi_tradingview(data['Close'], rsi_period)
-                data['OHLC_Avg'] = data.apply(calculate_ohlc_average, axis=1)
-                
-                # Detectar cruces
-                crosses = detect_rsi_crosses(data['RSI'], overbought, oversold)
+                # Calcular indicadores y detectar cruces - USANDO NUEVO MÉTODO DE WILDER
+                data['RSI'], crosses = cached_analyze_rsi(
+                    data_fingerprint(data['Close']), data['Close'], rsi_period, overbought, oversold
+                )
+                data['OHLC_Avg'] = calculate_ohlc_average(data)
                 
-                if not crosses:
+                if crosses.idx.size == 0:
                     st.warning("⚠️ No se detectaron cruces del RSI en el período analizado.")
                     return
                 
                 # Crear ciclos
                 cycles = create_cycles(crosses, len(data))
                 
+                # Clasificar ciclos: verde si el cierre final supera el precio de cruce
+                is_green = data['Close'].to_numpy()[cycles['end']] > data['OHLC_Avg'].to_numpy()[cycles['start']]
+                n_cycles = len(is_green)
+                green_cycles = int(is_green.sum())
+                
                 # Mostrar métricas
                 col1, col2, col3, col4 = st.columns(4)
                 
@@ -316,53 +509,59 @@ def main():
                     st.metric("📊 Total Velas", len(data))
                 
                 with col2:
-                    st.metric("🔄 Cruces RSI", len(crosses))
+                    st.metric("🔄 Cruces RSI", crosses.idx.size)
                 
                 with col3:
-                    green_cycles = sum(1 for i, cycle in enumerate(cycles) 
-                                     if data['Close'].iloc[cycle['end']] > data['OHLC_Avg'].iloc[cycle['start']])
                     st.metric("🟢 Ciclos Verdes", green_cycles)
                 
                 with col4:
-                    red_cycles = len(cycles) - green_cycles
+                    red_cycles = n_cycles - green_cycles
                     st.metric("🔴 Ciclos Rojos", red_cycles)
                 
                 # Crear y mostrar gráfico
-                fig = create_interactive_plot(symbol, data, crosses, cycles, show_price_labels, show_cross_points)
-                st.plotly_chart(fig, use_container_width=True)
+                fig = build_cached_plot(
+                    data_fingerprint(data[['Open', 'High', 'Low', 'Close']]), (rsi_period, overbought, oversold), symbol,
+                    show_price_labels, show_cross_points,
+                    data, crosses, cycles, is_green
+                )
+                st.plotly_chart(fig, use_container_width=True, key="rsi_chart")
                 
                 # Tabla de cruces
-                st.subheader("📋 Detalle de Cruces")
-                
-                crosses_data = []
-                for i, (idx, cross_type, rsi_value) in enumerate(crosses):
-                    if idx < len(data):
-                        date = data.index[idx].strftime('%Y-%m-%d %H:%M')
-                        price = data['OHLC_Avg'].iloc[idx]
-                        crosses_data.append({
-                            'Fecha': date,
-                            'Tipo': cross_type.capitalize(),
-                            'Precio': f"${price:.2f}",
-                            'RSI': f"{rsi_value:.1f}"
-                        })
-                
-                crosses_df = pd.DataFrame(crosses_data)
-                st.dataframe(crosses_df, use_container_width=True)
+                with st.expander("📋 Detalle de Cruces", expanded=False):
+                    valid = crosses.idx < len(data)
+                    cross_idx = crosses.idx[valid]
+                    crosses_df = format_crosses(
+                        pd.Series(data.index.take(cross_idx)),
+                        crosses.type_code[valid],
+                        data['OHLC_Avg'].to_numpy()[cross_idx],
+                        crosses.rsi[valid]
+                    )
+                    st.dataframe(crosses_df, use_container_width=True)
                 
                 # Estadísticas de ciclos
-                if cycles:
+                if n_cycles:
                     st.subheader("📈 Estadísticas de Ciclos")
                     
-                    win_rate = (green_cycles / len(cycles)) * 100
+                    win_rate = (green_cycles / n_cycles) * 100
                     
-                    col1, col2 = st.columns(2)
+                    col1, col2, col3 = st.columns(3)
                     
                     with col1:
                         st.metric("🎯 Tasa de Éxito", f"{win_rate:.1f}%")
                     
                     with col2:
-                        avg_cycle_length = sum(cycle['end'] - cycle['start'] + 1 for cycle in cycles) / len(cycles)
+                        avg_cycle_length = float((cycles['end'] - cycles['start'] + 1).mean())
                         st.metric("📏 Duración Promedio", f"{avg_cycle_length:.1f} velas")
+                    
+                    with col3:
+                        # Resta vectorizada sobre datetime64, sin crear objetos Timestamp por ciclo
+                        # Cada ciclo dura hasta el inicio del siguiente (el último, hasta su última vela
+                        # más un intervalo), igual que el conteo de velas end - start + 1
+                        timestamps = data.index.values
+                        next_starts = np.append(timestamps, timestamps[-1] + (timestamps[-1] - timestamps[-2]))
+                        durations = next_starts[cycles['end'] + 1] - timestamps[cycles['start']]
+                        avg_duration = pd.Timedelta(durations.mean()).floor('min')
+                        st.metric("⏱️ Tiempo Promedio", str(avg_duration))
                 
             except Exception as e:
                 st.error(f"❌ Error durante el análisis: {str(e)}")